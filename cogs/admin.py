@@ -711,12 +711,10 @@ class AdminCog(commands.Cog):
     async def _bundle_name_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        bundles = local_store.get_bundles(interaction.guild_id)
         return [
             app_commands.Choice(name=n, value=n)
-            for n in sorted(bundles.keys())
-            if current.lower() in n.lower()
-        ][:25]
+            for n in local_store.find_bundle_names(interaction.guild_id, current)
+        ]
 
     @bundle_delete.autocomplete("name")
     @bundle_add_role.autocomplete("name")
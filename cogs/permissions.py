@@ -1,30 +1,100 @@
+import io
+from bisect import bisect_right
+from itertools import accumulate
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from services import local_store
 from services.access import check_scope
-from services.sync import build_permission_plan, apply_permission_plan, diff_permission_plan
+from services.sync import (
+    PermissionPlan,
+    build_permission_plan,
+    apply_permission_plan,
+    diff_permission_plan,
+)
 
 # Max characters Discord allows in a single message
 _DISCORD_MAX = 2000
 
+# Previews longer than this go out as one attached file instead of a run of messages
+_PREVIEW_FILE_THRESHOLD = 8000
+
+# Appended to each piece of a line that had to be split across messages
+_CONTINUATION = " …"
+
+
+def _hard_split(line: str, max_len: int) -> list[str]:
+    """
+    Split a single line longer than max_len into pieces that each fit.
+    Cuts at the last space within budget so words stay whole, falling back
+    to a hard cut when there is none.  Every piece but the last is marked
+    with a continuation suffix.
+    """
+    budget = max_len - len(_CONTINUATION)
+    if budget < 1:
+        raise ValueError(
+            f"max_len {max_len} leaves no room for text beside the continuation marker"
+        )
+    pieces: list[str] = []
+    while len(line) > max_len:
+        cut = line.rfind(" ", 1, budget + 1)
+        if cut == -1:
+            cut = budget
+        pieces.append(line[:cut].rstrip() + _CONTINUATION)
+        line = line[cut:].lstrip()
+    if line:
+        pieces.append(line)
+    return pieces
+
 
 def _chunk_lines(lines: list[str], max_len: int = _DISCORD_MAX) -> list[str]:
     """Split a list of lines into chunks that fit within Discord's message limit."""
-    chunks, current = [], []
-    current_len = 0
-    for line in lines:
-        if current_len + len(line) + 1 > max_len:
-            chunks.append("\n".join(current))
-            current, current_len = [], 0
-        current.append(line)
-        current_len += len(line) + 1
-    if current:
-        chunks.append("\n".join(current))
+    if any(len(line) > max_len for line in lines):
+        lines = [
+            piece for line in lines
+            for piece in (_hard_split(line, max_len) if len(line) > max_len else (line,))
+        ]
+    # Running total of characters up to and including each line (+1 for its newline),
+    # so each split point is a single bisect instead of a per-line Python comparison.
+    # A chunk's last line carries no newline, hence the extra 1 in the budget.
+    ends = list(accumulate(len(line) + 1 for line in lines))
+    chunks: list[str] = []
+    start, base = 0, 0
+    while start < len(lines):
+        stop = bisect_right(ends, base + max_len + 1, lo=start)
+        if stop == start:
+            stop = start + 1   # always take at least one line — never emit an empty chunk
+        chunks.append("\n".join(lines[start:stop]))
+        base = ends[stop - 1]
+        start = stop
     return chunks
 
 
+async def _send_preview(interaction: discord.Interaction, lines: list[str]) -> None:
+    """
+    Send the preview header and diff chunks as ephemeral followups, in order.
+    Large previews are attached as a single text file instead, which also
+    caps the message path at a handful of chunks.
+    """
+    header = f"**Permission preview — {len(lines)} overwrite(s)**"
+    if sum(len(line) + 1 for line in lines) > _PREVIEW_FILE_THRESHOLD:
+        buf = io.BytesIO("\n".join(lines).encode("utf-8"))
+        await interaction.followup.send(
+            header,
+            file=discord.File(buf, filename="permission-preview.txt"),
+            ephemeral=True,
+        )
+        return
+
+    await interaction.followup.send(header, ephemeral=True)
+    # Sequential on purpose: a channel's lines can span a chunk boundary, and
+    # concurrent sends don't guarantee posting order.
+    for chunk in _chunk_lines(lines):
+        await interaction.followup.send(chunk, ephemeral=True)
+
+
 class SyncConfirmView(discord.ui.View):
     def __init__(self):
         super().__init__(timeout=60.0)
@@ -72,10 +142,75 @@ class SyncApplyView(discord.ui.View):
 class PermissionsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # guild_id → (local config stamp, plan).  Valid while the stamp matches;
+        # Discord-side changes drop the entry via the listeners below.
+        self._plan_cache: dict[int, tuple[tuple, PermissionPlan]] = {}
+        # guild_id → (plan, diff lines), filled only when a diff is actually shown.
+        # Valid while its plan is still the cached one.
+        self._diff_cache: dict[int, tuple[PermissionPlan, list[str]]] = {}
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return await check_scope(interaction)
 
+    async def _get_plan(self, guild: discord.Guild) -> PermissionPlan:
+        """Build (or reuse) the permission plan for the guild."""
+        stamp = local_store.get_sync_config_stamp(guild.id)
+        hit = self._plan_cache.get(guild.id)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        plan = await build_permission_plan(guild)
+        self._plan_cache[guild.id] = (stamp, plan)
+        return plan
+
+    async def _get_diff(self, guild: discord.Guild) -> list[str]:
+        """Diff lines for the current plan, computed on first request and reused with it."""
+        plan = await self._get_plan(guild)
+        hit = self._diff_cache.get(guild.id)
+        if hit is not None and hit[0] is plan:
+            return hit[1]
+        lines = diff_permission_plan(plan, guild)
+        self._diff_cache[guild.id] = (plan, lines)
+        return lines
+
+    def _invalidate_plan(self, guild: discord.Guild) -> None:
+        self._plan_cache.pop(guild.id, None)
+        self._diff_cache.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._invalidate_plan(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._invalidate_plan(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._invalidate_plan(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self._invalidate_plan(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        self._invalidate_plan(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._invalidate_plan(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        # A fresh session fires no channel events for overwrites changed offline.
+        self._invalidate_plan(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._invalidate_plan(guild)
+
     # ------------------------------------------------------------------
     # /preview-permissions
     # ------------------------------------------------------------------
@@ -89,22 +224,16 @@ class PermissionsCog(commands.Cog):
 
         guild = interaction.guild
         try:
-            plan = build_permission_plan(guild)
+            lines = await self._get_diff(guild)
         except Exception as e:
             await interaction.followup.send(f"Failed to build permission plan: `{e}`", ephemeral=True)
             return
 
-        lines = diff_permission_plan(plan, guild)
-
         if not lines:
             await interaction.followup.send("No permission changes detected.", ephemeral=True)
             return
 
-        await interaction.followup.send(
-            f"**Permission preview — {len(lines)} overwrite(s)**", ephemeral=True
-        )
-        for chunk in _chunk_lines(lines):
-            await interaction.followup.send(chunk, ephemeral=True)
+        await _send_preview(interaction, lines)
 
     # ------------------------------------------------------------------
     # /sync-permissions
@@ -119,7 +248,7 @@ class PermissionsCog(commands.Cog):
 
         guild = interaction.guild
         try:
-            plan = build_permission_plan(guild)
+            plan = await self._get_plan(guild)
         except Exception as e:
             await interaction.followup.send(f"Failed to build permission plan: `{e}`", ephemeral=True)
             return
@@ -160,11 +289,7 @@ class PermissionsCog(commands.Cog):
                 await interaction.followup.send("No permission changes detected.", ephemeral=True)
                 return
 
-            await interaction.followup.send(
-                f"**Permission preview — {len(lines)} overwrite(s)**", ephemeral=True
-            )
-            for chunk in _chunk_lines(lines):
-                await interaction.followup.send(chunk, ephemeral=True)
+            await _send_preview(interaction, lines)
 
             apply_view = SyncApplyView()
             apply_msg = await interaction.followup.send(
@@ -187,16 +312,21 @@ class PermissionsCog(commands.Cog):
             await apply_btn.response.edit_message(
                 content=f"Applying **{total}** overwrite(s)…", view=None
             )
-            applied, removed, errors = await apply_permission_plan(plan, guild)
+            applied, removed, errors, skipped = await apply_permission_plan(plan, guild)
 
         else:
             # "sync" — apply immediately
             await btn_interaction.response.edit_message(
                 content=f"Applying **{total}** overwrite(s)…", view=None
             )
-            applied, removed, errors = await apply_permission_plan(plan, guild)
+            applied, removed, errors, skipped = await apply_permission_plan(plan, guild)
+
+        # The overwrites just changed; don't wait for channel events to drop the cached diff.
+        self._invalidate_plan(guild)
 
         result = f"Done — **{applied}** applied"
+        if skipped:
+            result += f", **{skipped}** already up to date"
         if removed:
             result += f", **{removed}** stale overwrite(s) removed"
         result += "."
@@ -7,6 +7,8 @@ Bundles (named collections of roles applied together) are managed via
 Roles are stored by Discord ID (with legacy name fallback for older data).
 """
 
+import asyncio
+
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -21,17 +23,22 @@ from services.access import check_scope
 
 def _lookup_role(
     role_str: str,
-    by_id: dict[int, discord.Role],
-    by_name: dict[str, discord.Role],
+    guild: discord.Guild,
+    name_to_id: dict[str, int],
 ) -> discord.Role | None:
     """
     Resolve a stored role string to a discord.Role.
     Tries integer Discord ID first; falls back to name for legacy data.
+    Both paths end in guild.get_role, so the Role returned is always the
+    live object from discord.py's cache.
     """
     try:
-        return by_id.get(int(role_str))
+        rid = int(role_str)
     except ValueError:
-        return by_name.get(role_str)
+        rid = name_to_id.get(role_str)
+        if rid is None:
+            return None
+    return guild.get_role(rid)
 
 
 # ---------------------------------------------------------------------------
@@ -54,54 +61,92 @@ def _can_manage_member(executor: discord.Member, target: discord.Member) -> bool
     return executor.top_role > target.top_role
 
 
+def _missing_permissions_line(member: discord.Member) -> str:
+    return (
+        f"**{member.display_name}**: ⚠️ Missing permissions — make sure the bot's role "
+        "is above all roles it needs to manage."
+    )
+
+
 # ---------------------------------------------------------------------------
 # Bundle helpers
 # ---------------------------------------------------------------------------
 
+async def _send_bundle_not_found(interaction: discord.Interaction, bundle: str) -> None:
+    """Tell the user the bundle doesn't exist, listing the ones that do (pre-sorted index)."""
+    names = ", ".join(n for _, n in local_store.get_bundle_names(interaction.guild_id))
+    await interaction.followup.send(
+        f"Bundle **{bundle}** not found.\nAvailable bundles: {names or '(none defined yet)'}",
+        ephemeral=True,
+    )
+
+
+def _exclusive_group_index(
+    guild: discord.Guild,
+    name_to_id: dict[str, int],
+) -> tuple[dict[int, str], dict[str, list[discord.Role]]]:
+    """
+    Resolve the guild's exclusive groups once per command.
+    Returns (role ID → group name, group name → resolved roles).
+    Stored roles that no longer exist in Discord are dropped.
+    """
+    role_to_group: dict[int, str] = {}
+    group_roles: dict[str, list[discord.Role]] = {}
+    for group_name, role_strs in local_store.get_exclusive_groups(guild.id).items():
+        resolved = []
+        for rs in role_strs:
+            r = _lookup_role(rs, guild, name_to_id)
+            if r:
+                role_to_group[r.id] = group_name
+                resolved.append(r)
+        group_roles[group_name] = resolved
+    return role_to_group, group_roles
+
+
 async def _apply_bundle(
     member: discord.Member,
     bundle_roles: list[discord.Role],
-    guild: discord.Guild,
+    group_index: tuple[dict[int, str], dict[str, list[discord.Role]]],
 ) -> tuple[list[discord.Role], list[discord.Role]]:
     """
     Add all roles in bundle_roles to the member, automatically removing
     any conflicting roles from the same exclusive group.
 
+    group_index comes from _exclusive_group_index(), built once per command
+    rather than once per member.
+
     Returns (added, removed).
     """
-    to_remove: list[discord.Role] = []
-
-    groups = local_store.get_exclusive_groups(guild.id)
-    discord_roles_by_id: dict[int, discord.Role] = {r.id: r for r in guild.roles}
-    discord_roles_by_name: dict[str, discord.Role] = {r.name: r for r in guild.roles}
-
-    # Build role → group mapping using ID-first resolution
-    role_to_group: dict[discord.Role, str] = {}
-    for group_name, role_strs in groups.items():
-        for rs in role_strs:
-            r = _lookup_role(rs, discord_roles_by_id, discord_roles_by_name)
-            if r:
-                role_to_group[r] = group_name
+    role_to_group, group_roles = group_index
 
     # Find which exclusive groups the incoming roles belong to
-    incoming_groups: set[str] = set()
-    for role in bundle_roles:
-        g = role_to_group.get(role)
-        if g:
-            incoming_groups.add(g)
+    incoming_groups = {role_to_group[r.id] for r in bundle_roles if r.id in role_to_group}
 
     # Collect any roles the member already holds that conflict
+    member_role_ids = {r.id for r in member.roles}
+    to_remove: list[discord.Role] = []
     if incoming_groups:
-        member_roles_set = set(member.roles)
-        for group in incoming_groups:
-            for rs in groups[group]:
-                discord_role = _lookup_role(rs, discord_roles_by_id, discord_roles_by_name)
-                if discord_role and discord_role in member_roles_set and discord_role not in bundle_roles:
-                    to_remove.append(discord_role)
+        bundle_role_ids = {r.id for r in bundle_roles}
+        to_remove = [
+            gr
+            for group in incoming_groups
+            for gr in group_roles[group]
+            if gr.id in member_role_ids and gr.id not in bundle_role_ids
+        ]
 
-    if to_remove:
-        await member.remove_roles(*to_remove, reason="Exclusive group conflict — bundle assignment")
-    await member.add_roles(*bundle_roles, reason="Bundle assignment")
+    # One PATCH with the full role list replaces a remove_roles call plus one
+    # add_roles request per role.  @everyone (id == guild id) is never sent.
+    to_add = [r for r in bundle_roles if r.id not in member_role_ids]
+    if to_add or to_remove:
+        remove_ids = {r.id for r in to_remove}
+        new_roles = [
+            r for r in member.roles
+            if r.id != member.guild.id and r.id not in remove_ids
+        ] + to_add
+        reason = "Bundle assignment"
+        if to_remove:
+            reason += " (exclusive group conflict)"
+        await member.edit(roles=new_roles, reason=reason)
 
     return bundle_roles, to_remove
 
@@ -113,10 +158,44 @@ async def _apply_bundle(
 class RolesCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # guild_id → {role name: role ID} for legacy name-based entries.  IDs
+        # resolve through guild.get_role, so a stale entry can only miss, never
+        # hand back a detached Role.  Dropped on role changes and on (re)connect.
+        self._role_name_ids: dict[int, dict[str, int]] = {}
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return await check_scope(interaction)
 
+    def _get_role_name_ids(self, guild: discord.Guild) -> dict[str, int]:
+        """Return the cached role name → ID map for the guild, building it on first use."""
+        name_to_id = self._role_name_ids.get(guild.id)
+        if name_to_id is None:
+            name_to_id = {r.name: r.id for r in guild.roles}
+            self._role_name_ids[guild.id] = name_to_id
+        return name_to_id
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._role_name_ids.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._role_name_ids.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._role_name_ids.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        # A fresh session rebuilds every Role without firing role events for
+        # changes made while the bot was offline.
+        self._role_name_ids.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._role_name_ids.pop(guild.id, None)
+
     # ------------------------------------------------------------------
     # /assign
     # ------------------------------------------------------------------
@@ -146,25 +225,20 @@ class RolesCog(commands.Cog):
 
         bundles = local_store.get_bundles(interaction.guild_id)
         if bundle not in bundles:
-            names = ", ".join(sorted(bundles.keys())) or "(none defined yet)"
-            await interaction.followup.send(
-                f"Bundle **{bundle}** not found.\nAvailable bundles: {names}",
-                ephemeral=True,
-            )
+            await _send_bundle_not_found(interaction, bundle)
             return
 
         guild = interaction.guild
-        by_id: dict[int, discord.Role] = {r.id: r for r in guild.roles}
-        by_name: dict[str, discord.Role] = {r.name: r for r in guild.roles}
+        name_to_id = self._get_role_name_ids(guild)
 
-        bundle_roles = [
-            r for rs in bundles[bundle]
-            if (r := _lookup_role(rs, by_id, by_name)) is not None
-        ]
-        missing = [
-            rs for rs in bundles[bundle]
-            if _lookup_role(rs, by_id, by_name) is None
-        ]
+        bundle_roles: list[discord.Role] = []
+        missing: list[str] = []
+        for rs in bundles[bundle]:
+            r = _lookup_role(rs, guild, name_to_id)
+            if r is not None:
+                bundle_roles.append(r)
+            else:
+                missing.append(rs)
 
         if not bundle_roles:
             await interaction.followup.send(
@@ -182,25 +256,37 @@ class RolesCog(commands.Cog):
             )
             return
 
+        group_index = _exclusive_group_index(guild, name_to_id)
+        # _apply_bundle always adds the full bundle, so the name list is the same for every member
+        added_names = ", ".join(r.name for r in bundle_roles)
         members = [m for m in [member, member2, member3, member4, member5] if m is not None]
-        lines = []
+        lines: list[str] = []
+        pending: list[tuple[int, discord.Member]] = []   # (index into lines, member)
         for m in members:
             if not _can_manage_member(interaction.user, m):
                 lines.append(
                     f"**{m.display_name}**: ⚠️ Their role is equal to or above yours."
                 )
                 continue
-            try:
-                added, removed = await _apply_bundle(m, bundle_roles, guild)
-                line = f"**{m.display_name}**: added {', '.join(r.name for r in added)}"
+            pending.append((len(lines), m))
+            lines.append("")
+
+        # Each member is a separate rate-limit bucket, so the role edits can overlap.
+        results = await asyncio.gather(
+            *(_apply_bundle(m, bundle_roles, group_index) for _, m in pending),
+            return_exceptions=True,
+        )
+        for (i, m), result in zip(pending, results):
+            if isinstance(result, discord.Forbidden):
+                lines[i] = _missing_permissions_line(m)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                _, removed = result
+                line = f"**{m.display_name}**: added {added_names}"
                 if removed:
                     line += f"; removed (exclusive group) {', '.join(r.name for r in removed)}"
-                lines.append(line)
-            except discord.Forbidden:
-                lines.append(
-                    f"**{m.display_name}**: ⚠️ Missing permissions — make sure the bot's role "
-                    "is above all roles it needs to manage."
-                )
+                lines[i] = line
 
         if missing:
             lines.append("⚠️ Not found in Discord: " + ", ".join(missing))
@@ -211,12 +297,10 @@ class RolesCog(commands.Cog):
     async def assign_bundle_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        bundles = local_store.get_bundles(interaction.guild_id)
         return [
             app_commands.Choice(name=name, value=name)
-            for name in sorted(bundles.keys())
-            if current.lower() in name.lower()
-        ][:25]
+            for name in local_store.find_bundle_names(interaction.guild_id, current)
+        ]
 
     # ------------------------------------------------------------------
     # /remove
@@ -247,20 +331,15 @@ class RolesCog(commands.Cog):
 
         bundles = local_store.get_bundles(interaction.guild_id)
         if bundle not in bundles:
-            names = ", ".join(sorted(bundles.keys())) or "(none defined yet)"
-            await interaction.followup.send(
-                f"Bundle **{bundle}** not found.\nAvailable bundles: {names}",
-                ephemeral=True,
-            )
+            await _send_bundle_not_found(interaction, bundle)
             return
 
         guild = interaction.guild
-        by_id: dict[int, discord.Role] = {r.id: r for r in guild.roles}
-        by_name: dict[str, discord.Role] = {r.name: r for r in guild.roles}
+        name_to_id = self._get_role_name_ids(guild)
 
         all_bundle_roles = [
             r for rs in bundles[bundle]
-            if (r := _lookup_role(rs, by_id, by_name)) is not None
+            if (r := _lookup_role(rs, guild, name_to_id)) is not None
         ]
         blocked = _blocked_roles(interaction.user, all_bundle_roles)
         if blocked:
@@ -272,28 +351,36 @@ class RolesCog(commands.Cog):
             return
 
         members = [m for m in [member, member2, member3, member4, member5] if m is not None]
-        lines = []
+        lines: list[str] = []
+        pending: list[tuple[int, discord.Member, list[discord.Role]]] = []
         for m in members:
             if not _can_manage_member(interaction.user, m):
                 lines.append(
                     f"**{m.display_name}**: ⚠️ Their role is equal to or above yours."
                 )
                 continue
-            member_roles_set = set(m.roles)
-            roles_to_remove = [r for r in all_bundle_roles if r in member_roles_set]
+            member_role_ids = {r.id for r in m.roles}
+            roles_to_remove = [r for r in all_bundle_roles if r.id in member_role_ids]
             if not roles_to_remove:
                 lines.append(f"**{m.display_name}**: no roles from this bundle to remove")
                 continue
-            try:
-                await m.remove_roles(*roles_to_remove, reason=f"Bundle removal: {bundle}")
-                lines.append(
-                    f"**{m.display_name}**: removed {', '.join(r.name for r in roles_to_remove)}"
-                )
-            except discord.Forbidden:
-                lines.append(
-                    f"**{m.display_name}**: ⚠️ Missing permissions — make sure the bot's role "
-                    "is above all roles it needs to manage."
-                )
+            pending.append((len(lines), m, roles_to_remove))
+            lines.append("")
+
+        results = await asyncio.gather(
+            *(
+                m.remove_roles(*roles_to_remove, reason=f"Bundle removal: {bundle}")
+                for _, m, roles_to_remove in pending
+            ),
+            return_exceptions=True,
+        )
+        for (i, m, roles_to_remove), result in zip(pending, results):
+            if isinstance(result, discord.Forbidden):
+                lines[i] = _missing_permissions_line(m)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                lines[i] = f"**{m.display_name}**: removed {', '.join(r.name for r in roles_to_remove)}"
 
         await interaction.followup.send("\n".join(lines), ephemeral=True)
 
@@ -301,12 +388,10 @@ class RolesCog(commands.Cog):
     async def remove_bundle_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        bundles = local_store.get_bundles(interaction.guild_id)
         return [
             app_commands.Choice(name=name, value=name)
-            for name in sorted(bundles.keys())
-            if current.lower() in name.lower()
-        ][:25]
+            for name in local_store.find_bundle_names(interaction.guild_id, current)
+        ]
 
 
 async def setup(bot: commands.Bot):
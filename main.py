@@ -1,4 +1,6 @@
+import logging.handlers
 import os
+import queue
 import sys
 from pathlib import Path
 import discord
@@ -14,6 +16,25 @@ if not _token:
     print("Add it to your .env file and restart.")
     sys.exit(1)
 
+
+def _setup_logging() -> logging.handlers.QueueListener:
+    """
+    Route all logging (ours and discord.py's) through a queue, so the actual
+    stream write happens on a background thread instead of the event loop.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(
+        "[{asctime}] [{levelname:<8}] {name}: {message}", "%Y-%m-%d %H:%M:%S", style="{"
+    ))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 intents = discord.Intents.default()
 intents.members = True
 intents.guilds = True
@@ -124,5 +145,11 @@ class Bot(commands.Bot):
             pass  # Inviter has DMs closed — skip silently
 
 
+_log_listener = _setup_logging()
 bot = Bot()
-bot.run(_token)
+try:
+    # log_handler=None: logging is already configured above, so discord.py
+    # shouldn't attach its own (synchronous) stream handler.
+    bot.run(_token, log_handler=None)
+finally:
+    _log_listener.stop()
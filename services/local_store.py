@@ -11,7 +11,15 @@ read-modify-write cycle, so concurrent bot commands on the same guild cannot
 race and overwrite each other's changes.
 
 _save() writes to a temporary file first, then replaces the target atomically
-(os.replace), so a crash mid-write cannot leave a corrupt JSON file.
+(os.replace), so a crash mid-write cannot leave a corrupt JSON file.  Mutating
+functions skip _save() entirely when the change would be a no-op.
+
+All get_* read paths (hit on every command, scope check and autocomplete
+keystroke) go through _load_cached(), which keeps the parsed JSON in memory and
+re-reads only when the file's stat stamp changes.  Because _save() always lands a fresh temp
+file, every write — ours or an external edit — changes the stamp.  Cached data
+is shared between callers, so it must be treated as read-only; mutating
+functions read through the uncached _load() instead.
 
 For multi-instance deployments (e.g. multiple Railway workers sharing a
 volume) you would need a cross-process lock or a proper database instead.
@@ -22,6 +30,8 @@ import json
 import os
 import tempfile
 import threading
+from bisect import bisect_left
+from itertools import islice
 from pathlib import Path
 
 from config import PERMISSION_LEVELS_DEFAULT, BUNDLES_DEFAULT
@@ -45,9 +55,9 @@ def _get_lock(guild_id: int) -> threading.Lock:
 # ---------------------------------------------------------------------------
 
 def _guild_dir(guild_id: int) -> Path:
-    d = _DATA_DIR / str(guild_id)
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+    # Not created here: reads of a missing file fall back to defaults, and
+    # _save() creates the directory, so the hot read path makes no mkdir call.
+    return _DATA_DIR / str(guild_id)
 
 
 def _load(path: Path, default: dict) -> dict:
@@ -60,14 +70,44 @@ def _load(path: Path, default: dict) -> dict:
     return copy.deepcopy(default)
 
 
+# path → ((st_ino, st_mtime_ns, st_size) or None if missing, parsed data)
+_cache: dict[Path, tuple[tuple[int, int, int] | None, dict]] = {}
+
+
+def _stamp(path: Path) -> tuple[int, int, int] | None:
+    """(inode, mtime_ns, size) of path, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _load_cached(path: Path, default: dict) -> dict:
+    """
+    Like _load(), but reuses the last parse while the file is unchanged on disk.
+    A missing file is cached too (stamp None), so uncustomised guilds share one
+    copy of the default instead of deep-copying it on every read.
+    """
+    stamp = _stamp(path)
+    hit = _cache.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    data = _load(path, default)
+    _cache[path] = (stamp, data)
+    return data
+
+
 def _save(path: Path, data: dict) -> None:
     """Atomically write data to path via a temp file + os.replace."""
     dir_ = path.parent
+    dir_.mkdir(parents=True, exist_ok=True)
     fd, tmp = tempfile.mkstemp(dir=dir_, suffix=".tmp")
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
         os.replace(tmp, path)
+        _cache.pop(path, None)
     except Exception:
         try:
             os.unlink(tmp)
@@ -80,12 +120,16 @@ def _save(path: Path, data: dict) -> None:
 # Permission levels
 # ---------------------------------------------------------------------------
 
+def _permission_levels_path(guild_id: int) -> Path:
+    return _guild_dir(guild_id) / "permission_levels.json"
+
+
 def get_permission_levels(guild_id: int) -> dict[str, dict[str, bool]]:
     """
     Returns {level_name: {discord_attr: True | False}}.
     Omitted keys mean neutral (inherit from role/server defaults).
     """
-    return _load(_guild_dir(guild_id) / "permission_levels.json", PERMISSION_LEVELS_DEFAULT)
+    return _load_cached(_permission_levels_path(guild_id), PERMISSION_LEVELS_DEFAULT)
 
 
 def set_permission(guild_id: int, level_name: str, attr: str, value: bool | None) -> None:
@@ -95,167 +139,237 @@ def set_permission(guild_id: int, level_name: str, attr: str, value: bool | None
     Raises KeyError if level_name does not exist.
     """
     with _get_lock(guild_id):
-        levels = get_permission_levels(guild_id)
+        levels = _load(_permission_levels_path(guild_id), PERMISSION_LEVELS_DEFAULT)
         if level_name not in levels:
             raise KeyError(f"Permission level '{level_name}' not found")
+        if levels[level_name].get(attr) is value:
+            return  # already set (or already neutral) — skip the rewrite
         if value is None:
             levels[level_name].pop(attr, None)
         else:
             levels[level_name][attr] = value
-        _save(_guild_dir(guild_id) / "permission_levels.json", levels)
+        _save(_permission_levels_path(guild_id), levels)
 
 
 def create_level(guild_id: int, name: str, copy_from: str | None = None) -> None:
     """Create a new permission level, optionally cloning an existing one."""
     with _get_lock(guild_id):
-        levels = get_permission_levels(guild_id)
+        levels = _load(_permission_levels_path(guild_id), PERMISSION_LEVELS_DEFAULT)
         if name in levels:
             raise ValueError(f"Permission level '{name}' already exists")
         levels[name] = dict(levels[copy_from]) if copy_from else {}
-        _save(_guild_dir(guild_id) / "permission_levels.json", levels)
+        _save(_permission_levels_path(guild_id), levels)
 
 
 def delete_level(guild_id: int, name: str) -> None:
     with _get_lock(guild_id):
-        levels = get_permission_levels(guild_id)
+        levels = _load(_permission_levels_path(guild_id), PERMISSION_LEVELS_DEFAULT)
         if name not in levels:
             raise KeyError(f"Permission level '{name}' not found")
         del levels[name]
-        _save(_guild_dir(guild_id) / "permission_levels.json", levels)
+        _save(_permission_levels_path(guild_id), levels)
 
 
 def reset_levels_to_default(guild_id: int) -> None:
     """Overwrite the JSON file with the factory defaults from config.py."""
     with _get_lock(guild_id):
-        _save(_guild_dir(guild_id) / "permission_levels.json", copy.deepcopy(PERMISSION_LEVELS_DEFAULT))
+        _save(_permission_levels_path(guild_id), copy.deepcopy(PERMISSION_LEVELS_DEFAULT))
 
 
 # ---------------------------------------------------------------------------
 # Bundles
 # ---------------------------------------------------------------------------
 
+def _bundles_path(guild_id: int) -> Path:
+    return _guild_dir(guild_id) / "bundles.json"
+
+
 def get_bundles(guild_id: int) -> dict[str, list[str]]:
-    """Returns {bundle_name: [role_name, ...]}."""
-    return _load(_guild_dir(guild_id) / "bundles.json", BUNDLES_DEFAULT)
+    """Returns {bundle_name: [role_name, ...]}.  Cached — do not mutate the result."""
+    return _load_cached(_bundles_path(guild_id), BUNDLES_DEFAULT)
+
+
+# path → (the cached bundles dict the index was built from, sorted index)
+_bundle_name_index: dict[Path, tuple[dict, list[tuple[str, str]]]] = {}
+
+
+def get_bundle_names(guild_id: int) -> list[tuple[str, str]]:
+    """
+    Returns [(lowercase_name, name), ...] sorted by lowercase name, for autocomplete.
+    Rebuilt only when bundles.json changes.  Cached — do not mutate the result.
+    """
+    path = _bundles_path(guild_id)
+    bundles = _load_cached(path, BUNDLES_DEFAULT)
+    hit = _bundle_name_index.get(path)
+    if hit is not None and hit[0] is bundles:
+        return hit[1]
+    names = sorted((name.lower(), name) for name in bundles)
+    _bundle_name_index[path] = (bundles, names)
+    return names
+
+
+def find_bundle_names(guild_id: int, query: str, limit: int = 25) -> list[str]:
+    """
+    Bundle names matching query (case-insensitive), at most limit of them.
+    Prefix matches come first via bisect on the sorted index; names that only
+    contain query elsewhere fill any remaining slots.
+    """
+    index = get_bundle_names(guild_id)
+    q = query.lower()
+    matches: list[str] = []
+    for lower, name in islice(index, bisect_left(index, (q,)), None):
+        if not lower.startswith(q) or len(matches) == limit:
+            break
+        matches.append(name)
+    if len(matches) < limit:
+        for lower, name in index:
+            if q in lower and not lower.startswith(q):
+                matches.append(name)
+                if len(matches) == limit:
+                    break
+    return matches
 
 
 def create_bundle(guild_id: int, name: str) -> None:
     with _get_lock(guild_id):
-        bundles = get_bundles(guild_id)
+        bundles = _load(_bundles_path(guild_id), BUNDLES_DEFAULT)
         if name in bundles:
             raise ValueError(f"Bundle '{name}' already exists")
         bundles[name] = []
-        _save(_guild_dir(guild_id) / "bundles.json", bundles)
+        _save(_bundles_path(guild_id), bundles)
 
 
 def delete_bundle(guild_id: int, name: str) -> None:
     with _get_lock(guild_id):
-        bundles = get_bundles(guild_id)
+        bundles = _load(_bundles_path(guild_id), BUNDLES_DEFAULT)
         if name not in bundles:
             raise KeyError(f"Bundle '{name}' not found")
         del bundles[name]
-        _save(_guild_dir(guild_id) / "bundles.json", bundles)
+        _save(_bundles_path(guild_id), bundles)
 
 
 def add_role_to_bundle(guild_id: int, bundle_name: str, role_name: str) -> None:
     with _get_lock(guild_id):
-        bundles = get_bundles(guild_id)
+        bundles = _load(_bundles_path(guild_id), BUNDLES_DEFAULT)
         if bundle_name not in bundles:
             raise KeyError(f"Bundle '{bundle_name}' not found")
         if role_name not in bundles[bundle_name]:
             bundles[bundle_name].append(role_name)
-            _save(_guild_dir(guild_id) / "bundles.json", bundles)
+            _save(_bundles_path(guild_id), bundles)
 
 
 def remove_role_from_bundle(guild_id: int, bundle_name: str, role_name: str) -> None:
     with _get_lock(guild_id):
-        bundles = get_bundles(guild_id)
+        bundles = _load(_bundles_path(guild_id), BUNDLES_DEFAULT)
         if bundle_name not in bundles:
             raise KeyError(f"Bundle '{bundle_name}' not found")
+        if role_name not in bundles[bundle_name]:
+            return
         bundles[bundle_name] = [r for r in bundles[bundle_name] if r != role_name]
-        _save(_guild_dir(guild_id) / "bundles.json", bundles)
+        _save(_bundles_path(guild_id), bundles)
 
 
 # ---------------------------------------------------------------------------
 # Exclusive groups
 # ---------------------------------------------------------------------------
 
+def _exclusive_groups_path(guild_id: int) -> Path:
+    return _guild_dir(guild_id) / "exclusive_groups.json"
+
+
 def get_exclusive_groups(guild_id: int) -> dict[str, list[str]]:
     """Returns {group_name: [role_name, ...]}."""
-    return _load(_guild_dir(guild_id) / "exclusive_groups.json", {})
+    return _load_cached(_exclusive_groups_path(guild_id), {})
 
 
 def create_exclusive_group(guild_id: int, name: str) -> None:
     with _get_lock(guild_id):
-        groups = get_exclusive_groups(guild_id)
+        groups = _load(_exclusive_groups_path(guild_id), {})
         if name in groups:
             raise ValueError(f"Exclusive group '{name}' already exists")
         groups[name] = []
-        _save(_guild_dir(guild_id) / "exclusive_groups.json", groups)
+        _save(_exclusive_groups_path(guild_id), groups)
 
 
 def delete_exclusive_group(guild_id: int, name: str) -> None:
     with _get_lock(guild_id):
-        groups = get_exclusive_groups(guild_id)
+        groups = _load(_exclusive_groups_path(guild_id), {})
         if name not in groups:
             raise KeyError(f"Exclusive group '{name}' not found")
         del groups[name]
-        _save(_guild_dir(guild_id) / "exclusive_groups.json", groups)
+        _save(_exclusive_groups_path(guild_id), groups)
 
 
 def add_role_to_exclusive_group(guild_id: int, group_name: str, role_name: str) -> None:
     with _get_lock(guild_id):
-        groups = get_exclusive_groups(guild_id)
+        groups = _load(_exclusive_groups_path(guild_id), {})
         if group_name not in groups:
             raise KeyError(f"Exclusive group '{group_name}' not found")
         if role_name not in groups[group_name]:
             groups[group_name].append(role_name)
-            _save(_guild_dir(guild_id) / "exclusive_groups.json", groups)
+            _save(_exclusive_groups_path(guild_id), groups)
 
 
 def remove_role_from_exclusive_group(guild_id: int, group_name: str, role_name: str) -> None:
     with _get_lock(guild_id):
-        groups = get_exclusive_groups(guild_id)
+        groups = _load(_exclusive_groups_path(guild_id), {})
         if group_name not in groups:
             raise KeyError(f"Exclusive group '{group_name}' not found")
+        if role_name not in groups[group_name]:
+            return
         groups[group_name] = [r for r in groups[group_name] if r != role_name]
-        _save(_guild_dir(guild_id) / "exclusive_groups.json", groups)
+        _save(_exclusive_groups_path(guild_id), groups)
 
 
 # ---------------------------------------------------------------------------
 # Category baseline permissions
 # ---------------------------------------------------------------------------
 
+def _category_baselines_path(guild_id: int) -> Path:
+    return _guild_dir(guild_id) / "category_baselines.json"
+
+
 def get_category_baselines(guild_id: int) -> dict[str, str]:
     """Returns {category_discord_id: level_name}."""
-    return _load(_guild_dir(guild_id) / "category_baselines.json", {})
+    return _load_cached(_category_baselines_path(guild_id), {})
 
 
 def set_category_baseline(guild_id: int, category_id: str, level_name: str) -> None:
     with _get_lock(guild_id):
-        baselines = get_category_baselines(guild_id)
+        baselines = _load(_category_baselines_path(guild_id), {})
+        if baselines.get(category_id) == level_name:
+            return
         baselines[category_id] = level_name
-        _save(_guild_dir(guild_id) / "category_baselines.json", baselines)
+        _save(_category_baselines_path(guild_id), baselines)
 
 
 def clear_category_baseline(guild_id: int, category_id: str) -> None:
     with _get_lock(guild_id):
-        baselines = get_category_baselines(guild_id)
-        baselines.pop(category_id, None)
-        _save(_guild_dir(guild_id) / "category_baselines.json", baselines)
+        baselines = _load(_category_baselines_path(guild_id), {})
+        if category_id not in baselines:
+            return
+        del baselines[category_id]
+        _save(_category_baselines_path(guild_id), baselines)
 
 
 # ---------------------------------------------------------------------------
 # Access rules
 # ---------------------------------------------------------------------------
 
+_ACCESS_RULES_DEFAULT: dict = {"next_id": 1, "rules": []}
+
+
+def _access_rules_path(guild_id: int) -> Path:
+    return _guild_dir(guild_id) / "access_rules.json"
+
+
 def get_access_rules_data(guild_id: int) -> dict:
     """
     Returns {"next_id": int, "rules": [...]}.
     Each rule: {"id": int, "role_ids": [str], "target_type": "category"|"channel",
                 "target_ids": [str], "level": str}.
     """
-    return _load(_guild_dir(guild_id) / "access_rules.json", {"next_id": 1, "rules": []})
+    return _load_cached(_access_rules_path(guild_id), _ACCESS_RULES_DEFAULT)
 
 
 def add_access_rule(
@@ -267,7 +381,7 @@ def add_access_rule(
 ) -> int:
     """Add an access rule. Returns the new rule's integer ID."""
     with _get_lock(guild_id):
-        data = get_access_rules_data(guild_id)
+        data = _load(_access_rules_path(guild_id), _ACCESS_RULES_DEFAULT)
         rule_id = data["next_id"]
         data["rules"].append({
             "id": rule_id,
@@ -277,18 +391,18 @@ def add_access_rule(
             "level": level,
         })
         data["next_id"] = rule_id + 1
-        _save(_guild_dir(guild_id) / "access_rules.json", data)
+        _save(_access_rules_path(guild_id), data)
         return rule_id
 
 
 def remove_access_rule(guild_id: int, rule_id: int) -> None:
     with _get_lock(guild_id):
-        data = get_access_rules_data(guild_id)
+        data = _load(_access_rules_path(guild_id), _ACCESS_RULES_DEFAULT)
         before = len(data["rules"])
         data["rules"] = [r for r in data["rules"] if r["id"] != rule_id]
         if len(data["rules"]) == before:
             raise KeyError(f"Access rule #{rule_id} not found")
-        _save(_guild_dir(guild_id) / "access_rules.json", data)
+        _save(_access_rules_path(guild_id), data)
 
 
 def update_access_rule(
@@ -303,15 +417,34 @@ def update_access_rule(
     Raises KeyError if the rule is not found.
     """
     with _get_lock(guild_id):
-        data = get_access_rules_data(guild_id)
+        data = _load(_access_rules_path(guild_id), _ACCESS_RULES_DEFAULT)
         rule = next((r for r in data["rules"] if r["id"] == rule_id), None)
         if rule is None:
             raise KeyError(f"Access rule #{rule_id} not found")
+        if rule["level"] == level:
+            return dict(rule)
         rule["level"] = level
-        _save(_guild_dir(guild_id) / "access_rules.json", data)
+        _save(_access_rules_path(guild_id), data)
         return dict(rule)
 
 
+# ---------------------------------------------------------------------------
+# Change detection
+# ---------------------------------------------------------------------------
+
+def get_sync_config_stamp(guild_id: int) -> tuple:
+    """
+    Opaque value that changes whenever any input to the permission plan
+    (levels, category baselines, access rules) is written.  Cheap: one stat()
+    per file, no parsing.
+    """
+    return (
+        _stamp(_permission_levels_path(guild_id)),
+        _stamp(_category_baselines_path(guild_id)),
+        _stamp(_access_rules_path(guild_id)),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Prune helpers (remove stale references to deleted Discord objects)
 # ---------------------------------------------------------------------------
@@ -361,12 +494,12 @@ def prune_access_rules(
         return True
 
     with _get_lock(guild_id):
-        data = get_access_rules_data(guild_id)
+        data = _load(_access_rules_path(guild_id), _ACCESS_RULES_DEFAULT)
         before = len(data["rules"])
         data["rules"] = [r for r in data["rules"] if _rule_valid(r)]
         removed = before - len(data["rules"])
         if removed:
-            _save(_guild_dir(guild_id) / "access_rules.json", data)
+            _save(_access_rules_path(guild_id), data)
         return removed
 
 
@@ -376,12 +509,12 @@ def prune_category_baselines(guild_id: int, valid_category_ids: set[int]) -> int
     Returns the number of baselines removed.
     """
     with _get_lock(guild_id):
-        baselines = get_category_baselines(guild_id)
+        baselines = _load(_category_baselines_path(guild_id), {})
         before = len(baselines)
         kept = {k: v for k, v in baselines.items() if int(k) in valid_category_ids}
         removed = before - len(kept)
         if removed:
-            _save(_guild_dir(guild_id) / "category_baselines.json", kept)
+            _save(_category_baselines_path(guild_id), kept)
         return removed
 
 
@@ -391,7 +524,7 @@ def prune_bundle_roles(guild_id: int, valid_role_ids: set[int]) -> int:
     Returns the total number of role entries removed.
     """
     with _get_lock(guild_id):
-        bundles = get_bundles(guild_id)
+        bundles = _load(_bundles_path(guild_id), BUNDLES_DEFAULT)
         total_removed, changed = 0, False
         for name, role_strs in bundles.items():
             kept, count = _prune_role_list(role_strs, valid_role_ids)
@@ -400,7 +533,7 @@ def prune_bundle_roles(guild_id: int, valid_role_ids: set[int]) -> int:
                 total_removed += count
                 changed = True
         if changed:
-            _save(_guild_dir(guild_id) / "bundles.json", bundles)
+            _save(_bundles_path(guild_id), bundles)
         return total_removed
 
 
@@ -410,7 +543,7 @@ def prune_exclusive_group_roles(guild_id: int, valid_role_ids: set[int]) -> int:
     Returns the total number of role entries removed.
     """
     with _get_lock(guild_id):
-        groups = get_exclusive_groups(guild_id)
+        groups = _load(_exclusive_groups_path(guild_id), {})
         total_removed, changed = 0, False
         for name, role_strs in groups.items():
             kept, count = _prune_role_list(role_strs, valid_role_ids)
@@ -419,7 +552,7 @@ def prune_exclusive_group_roles(guild_id: int, valid_role_ids: set[int]) -> int:
                 total_removed += count
                 changed = True
         if changed:
-            _save(_guild_dir(guild_id) / "exclusive_groups.json", groups)
+            _save(_exclusive_groups_path(guild_id), groups)
         return total_removed
 
 
@@ -460,7 +593,7 @@ def get_bot_access(guild_id: int) -> dict[str, list[str]]:
         if migrated:
             _save(path, {"role_scopes": migrated})
         return migrated
-    data = _load(path, {"role_scopes": {}})
+    data = _load_cached(path, {"role_scopes": {}})
     return data.get("role_scopes", {})
 
 
@@ -470,10 +603,14 @@ def grant_bot_scope(guild_id: int, role_id: str, scopes: list[str]) -> None:
         path = _bot_access_path(guild_id)
         data = _load(path, {"role_scopes": {}})
         role_scopes = data.setdefault("role_scopes", {})
-        existing = set(role_scopes.get(role_id, []))
+        current = role_scopes.get(role_id, [])
+        existing = set(current)
         existing.update(scopes)
         # Preserve ALL_SCOPES ordering
-        role_scopes[role_id] = [s for s in _ALL_SCOPES if s in existing]
+        updated = [s for s in _ALL_SCOPES if s in existing]
+        if updated == current:
+            return
+        role_scopes[role_id] = updated
         _save(path, data)
 
 
@@ -485,6 +622,8 @@ def revoke_bot_scope(guild_id: int, role_id: str, scopes: list[str]) -> None:
         role_scopes = data.get("role_scopes", {})
         if role_id in role_scopes:
             remaining = [s for s in role_scopes[role_id] if s not in scopes]
+            if remaining == role_scopes[role_id]:
+                return
             if remaining:
                 role_scopes[role_id] = remaining
             else:
@@ -19,33 +19,93 @@ Category baselines and access rules come from local_store.
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass, field
+from functools import partial
 import discord
 
 from services import local_store
 
+log = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # Data model
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class OverwriteEntry:
     target: discord.Role | discord.Member
     overwrite: discord.PermissionOverwrite
     source: str   # human label e.g. "@everyone baseline → None"
 
 
-@dataclass
+@dataclass(slots=True)
 class PermissionPlan:
     """
     Maps each Discord category/channel id to the overwrites that should be set on it.
     plan.entries[channel_or_category_id] = [OverwriteEntry, ...]
     """
     entries: dict[int, list[OverwriteEntry]] = field(default_factory=dict)
+    # channel_or_category_id → {target: position in entries[id]}, so de-duplication
+    # is a dict probe rather than a scan of the channel's bucket.  entries stays
+    # the source of truth; a missing map is rebuilt from its bucket on demand.
+    _positions: dict[int, dict[discord.Role | discord.Member, int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+
+    def _positions_for(
+        self, target_id: int, bucket: list[OverwriteEntry]
+    ) -> dict[discord.Role | discord.Member, int]:
+        positions = self._positions.get(target_id)
+        if positions is None:
+            positions = {entry.target: i for i, entry in enumerate(bucket)}
+            self._positions[target_id] = positions
+        return positions
+
+    @staticmethod
+    def _put(
+        bucket: list[OverwriteEntry],
+        positions: dict[discord.Role | discord.Member, int],
+        entry: OverwriteEntry,
+    ) -> None:
+        i = positions.get(entry.target)
+        if i is None:
+            positions[entry.target] = len(bucket)
+            bucket.append(entry)
+        else:
+            bucket[i] = entry
 
     def add(self, target_id: int, entry: OverwriteEntry) -> None:
-        self.entries.setdefault(target_id, []).append(entry)
+        """
+        Add an overwrite for a channel/category.  A later entry for the same
+        target replaces the earlier one — Discord holds one overwrite per
+        target, so overlapping rules resolve last-wins, as they did when each
+        entry was written in turn.
+        """
+        # get-then-insert: setdefault would build a throwaway container on every call.
+        bucket = self.entries.get(target_id)
+        if bucket is None:
+            self.entries[target_id] = [entry]
+            self._positions[target_id] = {entry.target: 0}
+            return
+        self._put(bucket, self._positions_for(target_id, bucket), entry)
+
+    def extend(self, target_id: int, new_entries: Iterable[OverwriteEntry]) -> None:
+        """add() for a batch of entries — one dict probe per channel, then per entry."""
+        bucket = self.entries.get(target_id)
+        if bucket is None:
+            # Same last-wins rule as add(), applied within the batch.
+            by_target = {entry.target: entry for entry in new_entries}
+            if by_target:
+                self.entries[target_id] = list(by_target.values())
+                self._positions[target_id] = {t: i for i, t in enumerate(by_target)}
+            return
+        positions = self._positions_for(target_id, bucket)
+        for entry in new_entries:
+            self._put(bucket, positions, entry)
 
 
 # ---------------------------------------------------------------------------
@@ -65,101 +125,164 @@ def level_to_overwrite(level_name: str, guild_id: int) -> discord.PermissionOver
     return discord.PermissionOverwrite(**perms)
 
 
+def _level_overwrites(levels: dict[str, dict[str, bool]]) -> dict[str, discord.PermissionOverwrite]:
+    """
+    Every permission level for the guild, converted once per plan build.
+    Rules and baselines reuse a handful of levels, so building the overwrites
+    up front avoids a PermissionOverwrite per reference.
+    """
+    return {name: discord.PermissionOverwrite(**perms) for name, perms in levels.items()}
+
+
+# ---------------------------------------------------------------------------
+# Discord lookups
+# ---------------------------------------------------------------------------
+# guild.get_role / guild.get_channel are O(1) lookups into discord.py's own
+# caches, which it keeps current from gateway events.  Building our own id
+# maps from guild.roles / guild.channels (both sort on every access) would
+# only duplicate that work on every plan build.
+
+def _target_label(target) -> str:
+    """
+    Display name for an overwrite target.  channel.overwrites falls back to a
+    bare discord.Object (no .name) when the role/member isn't cached.
+    """
+    return str(getattr(target, "name", target.id))
+
+
+def _get_category(guild: discord.Guild, cat_id: int) -> discord.CategoryChannel | None:
+    channel = guild.get_channel(cat_id)
+    return channel if isinstance(channel, discord.CategoryChannel) else None
+
+
+def _get_channel(guild: discord.Guild, chan_id: int) -> discord.abc.GuildChannel | None:
+    """Like guild.get_channel, but never returns a category."""
+    channel = guild.get_channel(chan_id)
+    return None if isinstance(channel, discord.CategoryChannel) else channel
+
+
+def _resolve(id_str: str, lookup, cache: dict, kind: str):
+    """
+    Resolve a stored ID string to its Discord object via lookup(int_id).
+    Results — misses included — are memoised in cache, so an ID shared by
+    many rules is parsed, looked up and warned about once per plan build.
+    Returns None for bad or missing IDs.
+    """
+    if id_str in cache:
+        return cache[id_str]
+    try:
+        obj = lookup(int(id_str))
+    except ValueError:
+        obj = None
+    else:
+        if obj is None:
+            log.warning("%s %s not found in Discord — skipping", kind, id_str)
+    cache[id_str] = obj
+    return obj
+
+
 # ---------------------------------------------------------------------------
 # Plan builder
 # ---------------------------------------------------------------------------
 
-def build_permission_plan(guild: discord.Guild) -> PermissionPlan:
+def _load_sync_config(guild_id: int) -> tuple[dict, dict, dict]:
+    """(permission levels, category baselines, access rules data) from local store."""
+    return (
+        local_store.get_permission_levels(guild_id),
+        local_store.get_category_baselines(guild_id),
+        local_store.get_access_rules_data(guild_id),
+    )
+
+
+async def build_permission_plan(guild: discord.Guild) -> PermissionPlan:
     """
-    Reads category baselines and access rules from local store, then produces
-    a PermissionPlan describing exactly what overwrites should exist on every
-    category and channel.
+    Reads permission levels, category baselines and access rules from local
+    store, then produces a PermissionPlan describing exactly what overwrites
+    should exist on every category and channel.
 
-    No Discord API write calls are made here.
+    The store reads (file I/O) run in a worker thread so a sync never blocks
+    the event loop; the plan itself is built on the loop, where the guild's
+    Discord objects live.  No Discord API write calls are made here.
     """
-    plan = PermissionPlan()
+    levels, baselines, rules_data = await asyncio.to_thread(_load_sync_config, guild.id)
+    return _build_plan(guild, levels, baselines, rules_data)
+
 
-    discord_roles_by_id: dict[int, discord.Role] = {r.id: r for r in guild.roles}
-    discord_cats_by_id: dict[int, discord.CategoryChannel] = {c.id: c for c in guild.categories}
-    discord_channels_by_id: dict[int, discord.abc.GuildChannel] = {
-        c.id: c for c in guild.channels if not isinstance(c, discord.CategoryChannel)
-    }
+def _build_plan(
+    guild: discord.Guild,
+    levels: dict[str, dict[str, bool]],
+    baselines: dict[str, str],
+    rules_data: dict,
+) -> PermissionPlan:
+    """Pure plan construction from already-loaded config — no I/O."""
+    plan = PermissionPlan()
 
     everyone = guild.default_role
+    level_overwrites = _level_overwrites(levels)
+    neutral = discord.PermissionOverwrite()   # unknown level name → inherit everything
 
     # ------------------------------------------------------------------
     # 1. @everyone baseline for every category
     # ------------------------------------------------------------------
-    baselines = local_store.get_category_baselines(guild.id)
     for cat_id_str, level_name in baselines.items():
         try:
             cat_id = int(cat_id_str)
         except ValueError:
-            print(f"[sync] WARNING: invalid category ID '{cat_id_str}' in baselines — skipping")
+            log.warning("invalid category ID '%s' in baselines — skipping", cat_id_str)
             continue
 
-        discord_cat = discord_cats_by_id.get(cat_id)
+        discord_cat = _get_category(guild, cat_id)
         if not discord_cat:
-            print(f"[sync] WARNING: category {cat_id_str} not found in Discord — skipping baseline")
+            log.warning("category %s not found in Discord — skipping baseline", cat_id_str)
             continue
 
         plan.add(discord_cat.id, OverwriteEntry(
             target=everyone,
-            overwrite=level_to_overwrite(level_name, guild.id),
+            overwrite=level_overwrites.get(level_name, neutral),
             source=f"@everyone baseline → {level_name}",
         ))
 
     # ------------------------------------------------------------------
     # 2. Role-specific overwrites from access rules
     # ------------------------------------------------------------------
-    rules_data = local_store.get_access_rules_data(guild.id)
+    # ID string → Discord object (None if missing), shared across rules.
+    resolved_roles: dict[str, discord.Role | None] = {}
+    resolved_cats: dict[str, discord.CategoryChannel | None] = {}
+    resolved_channels: dict[str, discord.abc.GuildChannel | None] = {}
+    get_category = partial(_get_category, guild)
+    get_channel = partial(_get_channel, guild)
     for rule in rules_data.get("rules", []):
         level_name: str = rule["level"]
 
-        final_overwrite = level_to_overwrite(level_name, guild.id)
+        final_overwrite = level_overwrites.get(level_name, neutral)
 
         # Resolve target channels/categories
-        targets: list[discord.abc.GuildChannel] = []
         if rule["target_type"] == "category":
-            for tid_str in rule.get("target_ids", []):
-                try:
-                    tid = int(tid_str)
-                except ValueError:
-                    continue
-                dc = discord_cats_by_id.get(tid)
-                if dc:
-                    targets.append(dc)
-                else:
-                    print(f"[sync] WARNING: category {tid_str} not found in Discord — skipping")
+            lookup, cache, kind = get_category, resolved_cats, "category"
         elif rule["target_type"] == "channel":
-            for tid_str in rule.get("target_ids", []):
-                try:
-                    tid = int(tid_str)
-                except ValueError:
-                    continue
-                dc = discord_channels_by_id.get(tid)
-                if dc:
-                    targets.append(dc)
-                else:
-                    print(f"[sync] WARNING: channel {tid_str} not found in Discord — skipping")
-
-        # Resolve roles and add entries
-        for rid_str in rule.get("role_ids", []):
-            try:
-                rid = int(rid_str)
-            except ValueError:
-                continue
-            discord_role = discord_roles_by_id.get(rid)
-            if not discord_role:
-                print(f"[sync] WARNING: role {rid_str} not found in Discord — skipping")
-                continue
-
-            for target in targets:
-                plan.add(target.id, OverwriteEntry(
-                    target=discord_role,
-                    overwrite=final_overwrite,
-                    source=f"{discord_role.name} → {level_name}",
-                ))
+            lookup, cache, kind = get_channel, resolved_channels, "channel"
+        else:
+            continue
+        targets = [
+            target for tid_str in rule.get("target_ids", [])
+            if (target := _resolve(tid_str, lookup, cache, kind)) is not None
+        ]
+
+        # Resolve roles once, then add the rule's entries to each target in bulk.
+        # The same (immutable) entries are shared by every target of the rule.
+        rule_entries = [
+            OverwriteEntry(
+                target=discord_role,
+                overwrite=final_overwrite,
+                source=f"{discord_role.name} → {level_name}",
+            )
+            for rid_str in rule.get("role_ids", [])
+            if (discord_role := _resolve(rid_str, guild.get_role, resolved_roles, "role")) is not None
+        ]
+        if not rule_entries:
+            continue
+        for target in targets:
+            plan.extend(target.id, rule_entries)
 
     # ------------------------------------------------------------------
     # 3. Propagate category @everyone baseline to unsynced channels
@@ -170,7 +293,7 @@ def build_permission_plan(guild: discord.Guild) -> PermissionPlan:
     # baseline applied explicitly, or @everyone falls back to the
     # server default rather than the configured level.
     for chan_id, entries in list(plan.entries.items()):
-        channel = discord_channels_by_id.get(chan_id)
+        channel = _get_channel(guild, chan_id)
         if channel is None:
             continue  # it's a category entry — skip
         if getattr(channel, "permissions_synced", True):
@@ -188,7 +311,7 @@ def build_permission_plan(guild: discord.Guild) -> PermissionPlan:
 
         plan.add(chan_id, OverwriteEntry(
             target=everyone,
-            overwrite=level_to_overwrite(cat_level, guild.id),
+            overwrite=level_overwrites.get(cat_level, neutral),
             source=f"@everyone baseline (category) → {cat_level}",
         ))
 
@@ -199,42 +322,77 @@ def build_permission_plan(guild: discord.Guild) -> PermissionPlan:
 # Rate-limit helper
 # ---------------------------------------------------------------------------
 
-# Brief pause between Discord permission writes to stay well inside the
-# global rate limit (50 req/s).  discord.py handles per-route limits
-# automatically; this guards against bulk syncs on large servers.
-_WRITE_DELAY = 0.1   # seconds
+# Channels synced at once.  Each channel costs a single overwrites PATCH, so this
+# bounds the writes in flight across the guild; discord.py handles per-route
+# limits itself.
+_MAX_CONCURRENT_CHANNELS = 5
 
 
-async def _set_with_backoff(
+class _TokenBucket:
+    """
+    Minimal async token bucket: allows bursts of up to `rate` calls, then
+    paces callers to `rate` per `per` seconds.  Tokens may go negative —
+    each caller reserves its slot immediately and sleeps until it comes due,
+    so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        per: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self._capacity = float(rate)
+        self._fill_rate = rate / per
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(rate)
+        self._updated = clock()
+
+    async def acquire(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._fill_rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await self._sleep(-self._tokens / self._fill_rate)
+
+
+# Shared by every sync in the process, kept a little under Discord's global
+# limit (50 req/s) so other bot traffic still has headroom.
+_write_limiter = _TokenBucket(45)
+
+
+async def _edit_with_backoff(
     channel: discord.abc.GuildChannel,
-    target: discord.Role | discord.Member,
-    overwrite: discord.PermissionOverwrite | None,
+    overwrites: dict[discord.Role | discord.Member, discord.PermissionOverwrite],
     max_retries: int = 3,
 ) -> bool:
     """
-    Call channel.set_permissions with exponential backoff on 429s.
-    overwrite=None removes the overwrite (stale-cleanup path).
+    Replace every overwrite on channel in one channel.edit call, with
+    exponential backoff on 429s.  Targets missing from overwrites are removed.
     Returns True on success, False after all retries are exhausted.
     """
     delay = 1.0
     for attempt in range(max_retries):
         try:
-            await channel.set_permissions(target, overwrite=overwrite)
-            await asyncio.sleep(_WRITE_DELAY)
+            await _write_limiter.acquire()
+            await channel.edit(overwrites=overwrites, reason="Permission sync")
             return True
         except discord.HTTPException as e:
             if e.status == 429:
                 retry_after = float(getattr(e, "retry_after", delay))
-                print(
-                    f"[sync] Rate limited on #{channel.name} — "
-                    f"retrying in {retry_after:.1f}s (attempt {attempt + 1}/{max_retries})"
+                log.warning(
+                    "Rate limited on #%s — retrying in %.1fs (attempt %d/%d)",
+                    channel.name, retry_after, attempt + 1, max_retries,
                 )
                 await asyncio.sleep(retry_after)
                 delay *= 2
             else:
-                print(f"[sync] HTTP {e.status} on #{channel.name} for {target}: {e.text}")
+                log.error("HTTP %s on #%s: %s", e.status, channel.name, e.text)
                 return False
-    print(f"[sync] Gave up on #{channel.name} for {target} after {max_retries} attempts")
+    log.error("Gave up on #%s after %d attempts", channel.name, max_retries)
     return False
 
 
@@ -242,10 +400,38 @@ async def _set_with_backoff(
 # Apply plan
 # ---------------------------------------------------------------------------
 
+async def _apply_one_channel(
+    channel: discord.abc.GuildChannel,
+    entries: list[OverwriteEntry],
+) -> tuple[int, int, int, int]:
+    """
+    Bring one channel's overwrites in line with its plan entries in a single
+    request: planned overwrites are set and stale ones dropped together.
+    Entries Discord already matches are counted as skipped, and a channel
+    with nothing to change gets no request at all.
+    Returns (applied_count, removed_count, error_count, skipped_count).
+    """
+    current = channel.overwrites
+    desired = {entry.target: entry.overwrite for entry in entries}
+    stale = [target for target in current if target not in desired]
+    changed = sum(1 for entry in entries if current.get(entry.target) != entry.overwrite)
+    skipped = len(entries) - changed
+
+    if not changed and not stale:
+        return 0, 0, 0, skipped
+
+    if not await _edit_with_backoff(channel, desired):
+        return 0, 0, changed + len(stale), skipped
+
+    for target in stale:
+        log.info("Removed stale overwrite: #%s / %s", channel.name, _target_label(target))
+    return changed, len(stale), 0, skipped
+
+
 async def apply_permission_plan(
     plan: PermissionPlan,
     guild: discord.Guild,
-) -> tuple[int, int, int]:
+) -> tuple[int, int, int, int]:
     """
     For every channel/category in the plan:
       - Remove overwrites that exist in Discord but are NOT in the plan (stale).
@@ -255,42 +441,44 @@ async def apply_permission_plan(
     bots (e.g. ticketing systems) can manage their own channel permissions
     without interference.
 
-    Returns (applied_count, removed_count, error_count).
+    Each channel is synced with one channel.edit(overwrites=...) call, skipped
+    when it already matches; up to _MAX_CONCURRENT_CHANNELS run at once.
+
+    Returns (applied_count, removed_count, error_count, skipped_count), where
+    skipped overwrites were already set as planned.
     """
-    channels_by_id: dict[int, discord.abc.GuildChannel] = {
-        c.id: c for c in guild.channels
-    }
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_CHANNELS)
+
+    async def _bounded(channel, entries):
+        async with sem:
+            return await _apply_one_channel(channel, entries)
+
+    # --- Channels/categories that ARE in the plan ---
+    jobs = [
+        (channel, entries)
+        for target_id, entries in plan.entries.items()
+        if (channel := guild.get_channel(target_id))
+    ]
+    results = await asyncio.gather(
+        *(_bounded(channel, entries) for channel, entries in jobs),
+        return_exceptions=True,
+    )
+
     applied = 0
     removed = 0
     errors = 0
-
-    # --- Channels/categories that ARE in the plan ---
-    for target_id, entries in plan.entries.items():
-        channel = channels_by_id.get(target_id)
-        if not channel:
+    skipped = 0
+    for (channel, _), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            log.error("Failed to sync #%s: %s", channel.name, result, exc_info=result)
+            errors += 1
             continue
+        applied += result[0]
+        removed += result[1]
+        errors += result[2]
+        skipped += result[3]
 
-        planned_targets = {entry.target for entry in entries}
-
-        # Remove stale overwrites: exist on Discord, not in the plan for this channel.
-        for existing_target in list(channel.overwrites):
-            if existing_target not in planned_targets:
-                ok = await _set_with_backoff(channel, existing_target, None)
-                if ok:
-                    removed += 1
-                    print(f"[sync] Removed stale overwrite: #{channel.name} / {existing_target.name}")
-                else:
-                    errors += 1
-
-        # Apply planned overwrites.
-        for entry in entries:
-            ok = await _set_with_backoff(channel, entry.target, entry.overwrite)
-            if ok:
-                applied += 1
-            else:
-                errors += 1
-
-    return applied, removed, errors
+    return applied, removed, errors, skipped
 
 
 # ---------------------------------------------------------------------------
@@ -308,34 +496,31 @@ def diff_permission_plan(
       "✅ #general            |  @everyone           →  Chat (no change)"
       "🗑️  #general            |  OldRole             →  (removed — not in plan)"
     """
-    channels_by_id: dict[int, discord.abc.GuildChannel] = {
-        c.id: c for c in guild.channels
-    }
     lines: list[str] = []
 
     # --- Channels/categories in the plan ---
     for target_id, entries in plan.entries.items():
-        channel = channels_by_id.get(target_id)
+        channel = guild.get_channel(target_id)
         if not channel:
             lines.append(f"⚠️  Channel/category ID {target_id} not found in Discord")
             continue
 
-        current_overwrites = dict(channel.overwrites)
-        planned_targets = {entry.target for entry in entries}
+        # .overwrites builds a fresh dict on every access — read it once per channel.
+        current_overwrites = channel.overwrites
+        planned = {entry.target: entry for entry in entries}
 
         # Stale overwrites that will be removed.
-        for existing_target in current_overwrites:
-            if existing_target not in planned_targets:
-                lines.append(
-                    f"🗑️  #{channel.name}  |  {existing_target.name}  →  (removed — not in plan)"
-                )
+        for existing_target in [t for t in current_overwrites if t not in planned]:
+            lines.append(
+                f"🗑️  #{channel.name}  |  {_target_label(existing_target)}  →  (removed — not in plan)"
+            )
 
         # Planned overwrites (changed or unchanged).
-        for entry in entries:
-            current = current_overwrites.get(entry.target)
+        for target, entry in planned.items():
+            current = current_overwrites.get(target)
             status = "✅" if current == entry.overwrite else "📝"
             lines.append(
-                f"{status}  #{channel.name}  |  {entry.target.name}  →  {entry.source}"
+                f"{status}  #{channel.name}  |  {target.name}  →  {entry.source}"
             )
 
     return lines
@@ -17,6 +17,8 @@ def tmp_data_dir(tmp_path, monkeypatch):
 
     monkeypatch.setattr(ls, "_DATA_DIR", tmp_path)
     ls._locks.clear()
+    ls._cache.clear()
+    ls._bundle_name_index.clear()
     return tmp_path
 
 
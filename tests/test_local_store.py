@@ -57,6 +57,29 @@ class TestPermissionLevels:
         levels = local_store.get_permission_levels(1)
         assert levels == PERMISSION_LEVELS_DEFAULT
 
+    def test_writes_do_not_mutate_previously_returned_levels(self):
+        local_store.create_level(1, "Custom")
+        before = local_store.get_permission_levels(1)
+        local_store.set_permission(1, "Chat", "send_messages", False)
+        assert before["Chat"]["send_messages"] is True
+        assert local_store.get_permission_levels(1)["Chat"]["send_messages"] is False
+
+    def test_default_reads_share_one_copy(self):
+        first = local_store.get_permission_levels(1)
+        assert local_store.get_permission_levels(1) is first
+        assert first is not PERMISSION_LEVELS_DEFAULT
+        local_store.set_permission(1, "Chat", "send_messages", False)
+        assert first["Chat"]["send_messages"] is True
+        assert local_store.get_permission_levels(1)["Chat"]["send_messages"] is False
+
+    def test_noop_set_does_not_rewrite_file(self, tmp_data_dir):
+        local_store.set_permission(1, "Chat", "send_messages", False)
+        path = tmp_data_dir / "1" / "permission_levels.json"
+        before = path.stat().st_ino
+        local_store.set_permission(1, "Chat", "send_messages", False)
+        local_store.set_permission(1, "Chat", "not_a_set_key", None)
+        assert path.stat().st_ino == before
+
     def test_guilds_are_isolated(self):
         local_store.create_level(1, "GuildOneOnly")
         levels_2 = local_store.get_permission_levels(2)
@@ -109,6 +132,40 @@ class TestBundles:
         with pytest.raises(KeyError, match="not found"):
             local_store.add_role_to_bundle(1, "nope", "12345")
 
+    def test_get_reuses_parse_while_file_unchanged(self):
+        local_store.create_bundle(1, "raiders")
+        assert local_store.get_bundles(1) is local_store.get_bundles(1)
+
+    def test_bundle_names_sorted_case_insensitively(self):
+        for name in ["raiders", "Healers", "alts"]:
+            local_store.create_bundle(1, name)
+        assert local_store.get_bundle_names(1) == [
+            ("alts", "alts"), ("healers", "Healers"), ("raiders", "raiders"),
+        ]
+
+    def test_bundle_names_follow_writes(self):
+        local_store.create_bundle(1, "raiders")
+        local_store.get_bundle_names(1)
+        local_store.create_bundle(1, "alts")
+        assert [n for _, n in local_store.get_bundle_names(1)] == ["alts", "raiders"]
+
+    def test_find_bundle_names_prefix_before_substring(self):
+        for name in ["Raid Leads", "Guild Raiders", "raiders", "Healers"]:
+            local_store.create_bundle(1, name)
+        assert local_store.find_bundle_names(1, "rai") == ["Raid Leads", "raiders", "Guild Raiders"]
+
+    def test_find_bundle_names_respects_limit(self):
+        for i in range(30):
+            local_store.create_bundle(1, f"b{i:02}")
+        assert local_store.find_bundle_names(1, "b") == [f"b{i:02}" for i in range(25)]
+        assert len(local_store.find_bundle_names(1, "", limit=5)) == 5
+
+    def test_get_sees_external_edit(self, tmp_data_dir):
+        local_store.create_bundle(1, "raiders")
+        local_store.get_bundles(1)
+        (tmp_data_dir / "1" / "bundles.json").write_text(json.dumps({"healers": [], "tanks": []}))
+        assert local_store.get_bundles(1) == {"healers": [], "tanks": []}
+
 
 class TestExclusiveGroups:
     def test_get_returns_empty_default(self):
@@ -186,6 +243,22 @@ class TestAccessRules:
             local_store.update_access_rule(1, 999, level="Chat")
 
 
+class TestSyncConfigStamp:
+    def test_stable_without_writes(self):
+        local_store.set_category_baseline(1, "100", "View")
+        assert local_store.get_sync_config_stamp(1) == local_store.get_sync_config_stamp(1)
+
+    def test_changes_on_each_input(self):
+        before = local_store.get_sync_config_stamp(1)
+        local_store.set_category_baseline(1, "100", "View")
+        after_baseline = local_store.get_sync_config_stamp(1)
+        local_store.add_access_rule(1, ["111"], "category", ["100"], "Chat")
+        after_rule = local_store.get_sync_config_stamp(1)
+        local_store.set_permission(1, "Chat", "send_messages", False)
+        after_level = local_store.get_sync_config_stamp(1)
+        assert len({before, after_baseline, after_rule, after_level}) == 4
+
+
 class TestBotAccess:
     def test_get_returns_empty_when_no_files(self):
         assert local_store.get_bot_access(1) == {}
@@ -0,0 +1,104 @@
+"""Tests for cogs/permissions.py — message chunking helpers and the plan cache."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from cogs import permissions
+from cogs.permissions import _chunk_lines, _hard_split
+from services.sync import PermissionPlan
+
+
+class TestChunkLines:
+    def test_empty_input_produces_no_chunks(self):
+        assert _chunk_lines([]) == []
+
+    def test_short_lines_fit_in_one_chunk(self):
+        assert _chunk_lines(["a", "b", "c"]) == ["a\nb\nc"]
+
+    def test_splits_when_limit_exceeded(self):
+        # Each line costs 4 chars (3 + newline); 10 chars fits two lines.
+        assert _chunk_lines(["aaa", "bbb", "ccc"], max_len=10) == ["aaa\nbbb", "ccc"]
+
+    def test_chunks_respect_limit(self):
+        lines = [f"line {i} " + "x" * (i % 37) for i in range(500)]
+        chunks = _chunk_lines(lines, max_len=200)
+        assert all(len(c) <= 200 for c in chunks)
+        assert "\n".join(chunks) == "\n".join(lines)
+
+    def test_oversize_line_is_split_to_fit(self):
+        line = " ".join(["word"] * 100)   # 499 chars
+        chunks = _chunk_lines([line], max_len=100)
+        assert len(chunks) > 1
+        assert all(len(c) <= 100 for c in chunks)
+
+    def test_oversize_line_without_whitespace_is_split_to_fit(self):
+        chunks = _chunk_lines(["x" * 5000], max_len=2000)
+        assert "" not in chunks
+        assert all(len(c) <= 2000 for c in chunks)
+        assert "".join(c.removesuffix(" …") for c in chunks) == "x" * 5000
+
+    def test_line_of_exactly_max_len_is_one_chunk(self):
+        assert _chunk_lines(["a" * 2000], max_len=2000) == ["a" * 2000]
+
+    def test_lines_filling_limit_exactly_share_a_chunk(self):
+        # "aaaa\nbbbbb" is exactly 10 chars — the last line needs no newline.
+        assert _chunk_lines(["aaaa", "bbbbb", "c"], max_len=10) == ["aaaa\nbbbbb", "c"]
+
+
+class TestHardSplit:
+    def test_splits_on_whitespace(self):
+        pieces = _hard_split("alpha beta gamma delta", 12)
+        assert pieces == ["alpha beta …", "gamma delta"]
+        assert all(len(p) <= 12 for p in pieces)
+
+    def test_hard_cuts_without_whitespace(self):
+        pieces = _hard_split("x" * 25, 10)
+        assert all(len(p) <= 10 for p in pieces)
+        assert "".join(p.removesuffix(" …") for p in pieces) == "x" * 25
+
+    def test_rejects_limit_too_small_for_a_piece(self):
+        with pytest.raises(ValueError):
+            _hard_split("xxxxx", 2)
+        with pytest.raises(ValueError):
+            _chunk_lines(["xxxxx"], max_len=2)
+
+
+class TestPlanCache:
+    @pytest.fixture
+    def cog(self, monkeypatch):
+        self.builds = 0
+        self.diffs = 0
+
+        async def fake_build(guild):
+            self.builds += 1
+            return PermissionPlan()
+
+        def fake_diff(plan, guild):
+            self.diffs += 1
+            return ["line"]
+
+        monkeypatch.setattr(permissions, "build_permission_plan", fake_build)
+        monkeypatch.setattr(permissions, "diff_permission_plan", fake_diff)
+        return permissions.PermissionsCog(MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_plan_only_path_skips_diff(self, cog):
+        guild = MagicMock(id=99999)
+        await cog._get_plan(guild)
+        assert (self.builds, self.diffs) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_diff_is_reused_with_its_plan(self, cog):
+        guild = MagicMock(id=99999)
+        await cog._get_diff(guild)
+        await cog._get_diff(guild)
+        assert (self.builds, self.diffs) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_guild_available_drops_cache(self, cog):
+        guild = MagicMock(id=99999)
+        await cog._get_diff(guild)
+        await cog.on_guild_available(guild)
+        await cog._get_diff(guild)
+        assert (self.builds, self.diffs) == (2, 2)
@@ -0,0 +1,97 @@
+"""Tests for cogs/roles.py — bundle application and exclusive-group conflicts."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from cogs.roles import _apply_bundle, _exclusive_group_index
+from services import local_store
+from tests.conftest import make_mock_role
+
+
+def _make_member(roles):
+    member = MagicMock()
+    member.roles = roles
+    member.edit = AsyncMock()
+    return member
+
+
+def _guild(*roles):
+    """(mock guild with get_role, role name → ID map) for the given roles."""
+    by_id = {r.id: r for r in roles}
+    guild = MagicMock()
+    guild.id = 99999
+    guild.get_role = by_id.get
+    return guild, {r.name: r.id for r in roles}
+
+
+class TestExclusiveGroupIndex:
+    def test_resolves_ids_and_legacy_names(self):
+        trial = make_mock_role(1, "Trial")
+        member_role = make_mock_role(2, "Member")
+        local_store.create_exclusive_group(99999, "rank")
+        local_store.add_role_to_exclusive_group(99999, "rank", "1")
+        local_store.add_role_to_exclusive_group(99999, "rank", "Member")
+
+        role_to_group, group_roles = _exclusive_group_index(*_guild(trial, member_role))
+        assert role_to_group == {1: "rank", 2: "rank"}
+        assert group_roles["rank"] == [trial, member_role]
+
+    def test_deleted_roles_are_dropped(self):
+        local_store.create_exclusive_group(99999, "rank")
+        local_store.add_role_to_exclusive_group(99999, "rank", "404")
+
+        role_to_group, group_roles = _exclusive_group_index(*_guild())
+        assert role_to_group == {}
+        assert group_roles == {"rank": []}
+
+    def test_stale_name_entry_misses_instead_of_returning_old_role(self):
+        local_store.create_exclusive_group(99999, "rank")
+        local_store.add_role_to_exclusive_group(99999, "rank", "Member")
+        guild, _ = _guild()   # role 2 no longer exists in Discord
+
+        role_to_group, group_roles = _exclusive_group_index(guild, {"Member": 2})
+        assert role_to_group == {}
+        assert group_roles == {"rank": []}
+
+
+class TestApplyBundle:
+    @pytest.mark.asyncio
+    async def test_conflicting_group_role_is_removed(self):
+        trial = make_mock_role(1, "Trial")
+        member_role = make_mock_role(2, "Member")
+        local_store.create_exclusive_group(99999, "rank")
+        local_store.add_role_to_exclusive_group(99999, "rank", "1")
+        local_store.add_role_to_exclusive_group(99999, "rank", "2")
+        index = _exclusive_group_index(*_guild(trial, member_role))
+
+        m = _make_member([trial])
+        added, removed = await _apply_bundle(m, [member_role], index)
+        assert added == [member_role]
+        assert removed == [trial]
+        m.edit.assert_awaited_once()
+        assert m.edit.call_args.kwargs["roles"] == [member_role]
+
+    @pytest.mark.asyncio
+    async def test_keeps_unrelated_roles(self):
+        other = make_mock_role(5, "Other")
+        raider = make_mock_role(3, "Raider")
+        m = _make_member([other])
+        await _apply_bundle(m, [raider], ({}, {}))
+        assert m.edit.call_args.kwargs["roles"] == [other, raider]
+
+    @pytest.mark.asyncio
+    async def test_no_request_when_already_applied(self):
+        raider = make_mock_role(3, "Raider")
+        m = _make_member([raider])
+        await _apply_bundle(m, [raider], ({}, {}))
+        m.edit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_groups_only_adds(self):
+        raider = make_mock_role(3, "Raider")
+        m = _make_member([])
+        added, removed = await _apply_bundle(m, [raider], ({}, {}))
+        assert added == [raider]
+        assert removed == []
+        assert m.edit.call_args.kwargs["roles"] == [raider]
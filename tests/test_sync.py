@@ -1,7 +1,8 @@
 """Tests for services/sync.py — permission plan building and diffing."""
 
 import discord
-from unittest.mock import MagicMock
+import pytest
+from unittest.mock import AsyncMock, MagicMock
 
 from services import sync, local_store
 from tests.conftest import make_mock_role
@@ -43,6 +44,11 @@ def _make_guild(guild_id=99999, roles=None, categories=None, channels=None):
     guild.categories = cats
     guild.channels = cats + chans
 
+    roles_by_id = {r.id: r for r in all_roles}
+    channels_by_id = {c.id: c for c in cats + chans}
+    guild.get_role = lambda rid: roles_by_id.get(rid)
+    guild.get_channel = lambda cid: channels_by_id.get(cid)
+
     return guild
 
 
@@ -62,51 +68,57 @@ class TestLevelToOverwrite:
 
 
 class TestBuildPermissionPlan:
-    def test_empty_config_produces_empty_plan(self):
+    @pytest.mark.asyncio
+    async def test_empty_config_produces_empty_plan(self):
         guild = _make_guild()
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         assert plan.entries == {}
 
-    def test_category_baseline_produces_everyone_entry(self):
+    @pytest.mark.asyncio
+    async def test_category_baseline_produces_everyone_entry(self):
         cat = _make_category(500)
         guild = _make_guild(categories=[cat])
         local_store.set_category_baseline(guild.id, "500", "None")
 
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         assert 500 in plan.entries
         entries = plan.entries[500]
         assert len(entries) == 1
         assert entries[0].target == guild.default_role
         assert entries[0].overwrite.view_channel is False
 
-    def test_access_rule_adds_role_entry(self):
+    @pytest.mark.asyncio
+    async def test_access_rule_adds_role_entry(self):
         cat = _make_category(500)
         role = make_mock_role(111, "Raiders")
         guild = _make_guild(roles=[role], categories=[cat])
         local_store.add_access_rule(guild.id, ["111"], "category", ["500"], "Chat")
 
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         assert 500 in plan.entries
         role_entries = [e for e in plan.entries[500] if e.target == role]
         assert len(role_entries) == 1
         assert role_entries[0].overwrite.send_messages is True
 
-    def test_missing_category_skipped_gracefully(self):
+    @pytest.mark.asyncio
+    async def test_missing_category_skipped_gracefully(self):
         guild = _make_guild()
         local_store.set_category_baseline(guild.id, "999", "View")
 
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         assert 999 not in plan.entries
 
-    def test_missing_role_skipped_gracefully(self):
+    @pytest.mark.asyncio
+    async def test_missing_role_skipped_gracefully(self):
         cat = _make_category(500)
         guild = _make_guild(categories=[cat])
         local_store.add_access_rule(guild.id, ["999"], "category", ["500"], "Chat")
 
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         assert 500 not in plan.entries or len(plan.entries.get(500, [])) == 0
 
-    def test_unsynced_channel_gets_baseline_propagated(self):
+    @pytest.mark.asyncio
+    async def test_unsynced_channel_gets_baseline_propagated(self):
         cat = _make_category(500)
         role = make_mock_role(111, "Raiders")
         chan = _make_channel(600, category_id=500, synced=False)
@@ -115,26 +127,90 @@ class TestBuildPermissionPlan:
         local_store.set_category_baseline(guild.id, "500", "None")
         local_store.add_access_rule(guild.id, ["111"], "channel", ["600"], "Chat")
 
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         chan_entries = plan.entries.get(600, [])
         targets = {e.target for e in chan_entries}
         assert guild.default_role in targets
         assert role in targets
 
-    def test_channel_access_rule(self):
+    @pytest.mark.asyncio
+    async def test_channel_access_rule(self):
         cat = _make_category(500)
         role = make_mock_role(111, "Raiders")
         chan = _make_channel(600, category_id=500, synced=True)
         guild = _make_guild(roles=[role], categories=[cat], channels=[chan])
         local_store.add_access_rule(guild.id, ["111"], "channel", ["600"], "View")
 
-        plan = sync.build_permission_plan(guild)
+        plan = await sync.build_permission_plan(guild)
         assert 600 in plan.entries
         role_entries = [e for e in plan.entries[600] if e.target == role]
         assert len(role_entries) == 1
         assert role_entries[0].overwrite.view_channel is True
 
 
+class TestPermissionPlan:
+    def test_same_target_is_replaced_not_duplicated(self):
+        role = make_mock_role(111, "Raiders")
+        plan = sync.PermissionPlan()
+        plan.add(500, sync.OverwriteEntry(role, discord.PermissionOverwrite(view_channel=True), "Raiders -> View"))
+        plan.add(500, sync.OverwriteEntry(role, discord.PermissionOverwrite(send_messages=True), "Raiders -> Chat"))
+        assert [e.source for e in plan.entries[500]] == ["Raiders -> Chat"]
+
+    def test_extend_matches_repeated_add(self):
+        a, b = make_mock_role(111, "A"), make_mock_role(222, "B")
+        view = discord.PermissionOverwrite(view_channel=True)
+        chat = discord.PermissionOverwrite(send_messages=True)
+        batch = [
+            sync.OverwriteEntry(a, view, "A"),
+            sync.OverwriteEntry(b, view, "B"),
+            sync.OverwriteEntry(a, chat, "A2"),
+        ]
+        later = sync.OverwriteEntry(b, chat, "B2")
+
+        extended, added = sync.PermissionPlan(), sync.PermissionPlan()
+        extended.extend(500, batch)
+        extended.extend(500, [later])
+        for entry in batch + [later]:
+            added.add(500, entry)
+        assert [e.source for e in extended.entries[500]] == ["A2", "B2"]
+        assert [e.source for e in added.entries[500]] == ["A2", "B2"]
+
+    def test_replacement_keeps_position(self):
+        a, b, c = (make_mock_role(i, n) for i, n in ((1, "A"), (2, "B"), (3, "C")))
+        ow = discord.PermissionOverwrite(view_channel=True)
+        plan = sync.PermissionPlan()
+        plan.extend(500, [sync.OverwriteEntry(a, ow, "A"), sync.OverwriteEntry(b, ow, "B")])
+        plan.add(500, sync.OverwriteEntry(c, ow, "C"))
+        plan.extend(500, [sync.OverwriteEntry(b, ow, "B2")])
+        plan.add(500, sync.OverwriteEntry(a, ow, "A2"))
+        assert [e.source for e in plan.entries[500]] == ["A2", "B2", "C"]
+
+    def test_add_keeps_entries_passed_to_constructor(self):
+        a, b = make_mock_role(1, "A"), make_mock_role(2, "B")
+        ow = discord.PermissionOverwrite(view_channel=True)
+        plan = sync.PermissionPlan(entries={500: [sync.OverwriteEntry(a, ow, "A")]})
+        plan.add(500, sync.OverwriteEntry(b, ow, "B"))
+        plan.extend(500, [sync.OverwriteEntry(a, ow, "A2")])
+        assert [e.source for e in plan.entries[500]] == ["A2", "B"]
+
+    def test_extend_with_nothing_adds_no_channel(self):
+        plan = sync.PermissionPlan()
+        plan.extend(500, [])
+        assert plan.entries == {}
+
+    @pytest.mark.asyncio
+    async def test_overlapping_rules_produce_one_entry(self):
+        cat = _make_category(500)
+        role = make_mock_role(111, "Raiders")
+        guild = _make_guild(roles=[role], categories=[cat])
+        local_store.add_access_rule(guild.id, ["111"], "category", ["500"], "View")
+        local_store.add_access_rule(guild.id, ["111"], "category", ["500"], "Chat")
+
+        plan = await sync.build_permission_plan(guild)
+        assert len(plan.entries[500]) == 1
+        assert plan.entries[500][0].overwrite.send_messages is True
+
+
 class TestDiffPermissionPlan:
     def test_empty_plan_empty_diff(self):
         guild = _make_guild()
@@ -157,3 +233,139 @@ class TestDiffPermissionPlan:
 
         lines = sync.diff_permission_plan(plan, guild)
         assert len(lines) == 1
+
+
+    def test_stale_lines_follow_channel_overwrite_order(self):
+        roles = [make_mock_role(rid, f"R{rid}") for rid in (9, 3, 7, 1)]
+        chan = _make_channel(600)
+        chan.overwrites = {r: discord.PermissionOverwrite() for r in roles}
+        guild = _make_guild(roles=roles, channels=[chan])
+
+        plan = sync.PermissionPlan()
+        plan.add(600, sync.OverwriteEntry(
+            target=guild.default_role,
+            overwrite=discord.PermissionOverwrite(view_channel=False),
+            source="@everyone baseline -> None",
+        ))
+        lines = sync.diff_permission_plan(plan, guild)
+        assert [line.split("|")[1].split("→")[0].strip() for line in lines[:4]] == ["R9", "R3", "R7", "R1"]
+
+class TestApplyPermissionPlan:
+    @staticmethod
+    def _plan(target, overwrite):
+        plan = sync.PermissionPlan()
+        plan.add(600, sync.OverwriteEntry(
+            target=target, overwrite=overwrite, source="@everyone baseline -> None",
+        ))
+        return plan
+
+    @pytest.mark.asyncio
+    async def test_one_edit_applies_planned_and_removes_stale(self):
+        stale = make_mock_role(222, "OldRole")
+        chan = _make_channel(600)
+        chan.overwrites = {stale: discord.PermissionOverwrite(view_channel=True)}
+        chan.edit = AsyncMock()
+        guild = _make_guild(roles=[stale], channels=[chan])
+        ow = discord.PermissionOverwrite(view_channel=False)
+
+        result = await sync.apply_permission_plan(self._plan(guild.default_role, ow), guild)
+        assert result == (1, 1, 0, 0)
+        chan.edit.assert_awaited_once()
+        assert chan.edit.await_args.kwargs["overwrites"] == {guild.default_role: ow}
+
+    @pytest.mark.asyncio
+    async def test_uncached_stale_target_is_removed_without_error(self):
+        chan = _make_channel(600)
+        chan.overwrites = {discord.Object(id=777, type=discord.Member): discord.PermissionOverwrite()}
+        chan.edit = AsyncMock()
+        guild = _make_guild(channels=[chan])
+        ow = discord.PermissionOverwrite(view_channel=False)
+
+        result = await sync.apply_permission_plan(self._plan(guild.default_role, ow), guild)
+        assert result == (1, 1, 0, 0)
+        lines = sync.diff_permission_plan(self._plan(guild.default_role, ow), guild)
+        assert any("777" in line for line in lines)
+
+    @pytest.mark.asyncio
+    async def test_channel_already_in_sync_is_not_edited(self):
+        chan = _make_channel(600)
+        chan.edit = AsyncMock()
+        guild = _make_guild(channels=[chan])
+        chan.overwrites = {guild.default_role: discord.PermissionOverwrite(view_channel=False)}
+
+        plan = self._plan(guild.default_role, discord.PermissionOverwrite(view_channel=False))
+        assert await sync.apply_permission_plan(plan, guild) == (0, 0, 0, 1)
+        chan.edit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_matching_entries_counted_as_skipped(self):
+        role = make_mock_role(111, "Raiders")
+        chan = _make_channel(600)
+        chan.edit = AsyncMock()
+        guild = _make_guild(roles=[role], channels=[chan])
+        chan.overwrites = {guild.default_role: discord.PermissionOverwrite(view_channel=False)}
+
+        plan = self._plan(guild.default_role, discord.PermissionOverwrite(view_channel=False))
+        plan.add(600, sync.OverwriteEntry(
+            target=role, overwrite=discord.PermissionOverwrite(view_channel=True), source="Raiders -> View",
+        ))
+        assert await sync.apply_permission_plan(plan, guild) == (1, 0, 0, 1)
+        chan.edit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unexpected_failure_counts_as_error(self):
+        chan = _make_channel(600)
+        chan.edit = AsyncMock(side_effect=RuntimeError("boom"))
+        guild = _make_guild(channels=[chan])
+
+        plan = self._plan(guild.default_role, discord.PermissionOverwrite(view_channel=False))
+        assert await sync.apply_permission_plan(plan, guild) == (0, 0, 1, 0)
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_burst_within_capacity_does_not_wait(self):
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        bucket = sync._TokenBucket(3, sleep=fake_sleep)
+        for _ in range(3):
+            await bucket.acquire()
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_calls_past_capacity_are_paced(self):
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        bucket = sync._TokenBucket(2, clock=lambda: 100.0, sleep=fake_sleep)
+        for _ in range(4):
+            await bucket.acquire()
+        assert sleeps == [0.5, 1.0]
+
+
+class TestResolve:
+    def test_hit_is_looked_up_once(self):
+        role = make_mock_role(111, "Raiders")
+        lookup = MagicMock(return_value=role)
+        cache = {}
+        assert sync._resolve("111", lookup, cache, "role") is role
+        assert sync._resolve("111", lookup, cache, "role") is role
+        lookup.assert_called_once_with(111)
+
+    def test_invalid_id_returns_none(self):
+        lookup = MagicMock()
+        assert sync._resolve("not-an-id", lookup, {}, "role") is None
+        lookup.assert_not_called()
+
+    def test_miss_is_looked_up_and_warned_once(self, caplog):
+        lookup = MagicMock(return_value=None)
+        cache = {}
+        assert sync._resolve("999", lookup, cache, "role") is None
+        assert sync._resolve("999", lookup, cache, "role") is None
+        lookup.assert_called_once_with(999)
+        assert caplog.text.count("role 999 not found") == 1